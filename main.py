@@ -2,16 +2,26 @@ import os
 import sys
 import random
 import math
+import time
 import json
+import atexit
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import pygame
+import pygame.freetype
 from pygame import mixer
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
 from dotenv import load_dotenv
 
 load_dotenv()
 
 pygame.init()
+pygame.freetype.init()
 mixer.init()
 
 # ----------------------------------------------
@@ -19,9 +29,133 @@ mixer.init()
 # ----------------------------------------------
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Comandos frequentes preparados uma vez por conexão (o servidor não refaz o
+# parse/plano a cada chamada). O endpoint "-pooler" do Neon (PgBouncer em modo
+# transação) não mantém PREPARE entre transações, então ali usa o SQL direto.
+USE_PREPARED = "-pooler" not in (DATABASE_URL or "")
+PREPARED_SQL = {
+    "get_user": """
+        SELECT username, balance, daily_score, high_score, shield, double_jump
+        FROM users
+        WHERE username = %s
+    """,
+    "update_user": """
+        UPDATE users
+        SET balance = balance + %s,
+            daily_score = GREATEST(daily_score, %s),
+            high_score = GREATEST(high_score, %s),
+            shield = shield + %s,
+            double_jump = double_jump + %s
+        WHERE username = %s
+    """,
+    "finalize_session": """
+        WITH updated AS (
+            UPDATE users
+            SET daily_score = GREATEST(daily_score, %s),
+                high_score = GREATEST(high_score, %s)
+            WHERE username = %s
+        )
+        INSERT INTO scores (username, score)
+        VALUES (%s, %s)
+    """,
+    "top_scores": """
+        SELECT username, score
+        FROM scores
+        ORDER BY score DESC
+        LIMIT %s
+    """,
+    "add_to_pot": """
+        INSERT INTO daily_state (day, pot)
+        VALUES (CURRENT_DATE, %s)
+        ON CONFLICT (day) DO UPDATE SET pot = daily_state.pot + EXCLUDED.pot
+    """,
+    "daily_pot": """
+        SELECT COALESCE(SUM(pot), 0) FROM daily_state WHERE day <= CURRENT_DATE
+    """,
+}
+
+def _prepare_sql(name, sql):
+    """Converte os %s de PREPARED_SQL nos parâmetros $1, $2... do PREPARE."""
+    parts = sql.split("%s")
+    body = parts[0] + "".join(f"${i}{part}" for i, part in enumerate(parts[1:], 1))
+    return f"PREPARE {name} AS {body}"
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """Conexão que lembra quais comandos de PREPARED_SQL já preparou."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+def db_execute(cur, name, params):
+    """Executa um comando de PREPARED_SQL, preparando-o na conexão no primeiro uso."""
+    if not USE_PREPARED:
+        cur.execute(PREPARED_SQL[name], params)
+        return
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute(_prepare_sql(name, PREPARED_SQL[name]))
+        conn.prepared.add(name)
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+# Conexões abertas uma vez e reaproveitadas: cada psycopg2.connect() ao Neon
+# custa um handshake TCP + TLS + autenticação. O pool do psycopg2 fecha, ao
+# devolver, as conexões ociosas além de minconn; com 2 ficam abertas a da
+# thread principal e a da fila de escrita, que costumam estar em uso juntas.
+DB_POOL = psycopg2.pool.ThreadedConnectionPool(
+    minconn=2,
+    maxconn=5,
+    dsn=DATABASE_URL,
+    connection_factory=PreparedConnection,
+    cursor_factory=psycopg2.extras.RealDictCursor
+)
+atexit.register(DB_POOL.closeall)
+
+# RealDictCursor é o padrão (as linhas de users são usadas como dict); consultas
+# que só leem um ou dois valores usam o cursor de tuplas, sem montar um dict por linha
+TUPLE_CURSOR = psycopg2.extensions.cursor
+
+@contextmanager
 def db_connect():
-    """Retorna uma conexão para o banco de dados Neon."""
-    return psycopg2.connect(DATABASE_URL, cursor_factory=psycopg2.extras.RealDictCursor)
+    """Empresta uma conexão do pool para o banco de dados Neon.
+
+    Faz commit ao sair do bloco (rollback em caso de erro) e devolve a conexão;
+    conexões que caíram são descartadas em vez de voltar ao pool.
+    """
+    conn = DB_POOL.getconn()
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        DB_POOL.putconn(conn, close=broken)
+
+# Escritas que o jogo não precisa esperar (e leituras feitas em segundo plano)
+# rodam nesta thread, fora do loop de render. Um único worker garante que sejam
+# aplicadas na ordem em que foram pedidas, então uma leitura enfileirada já vê
+# as escritas anteriores; na saída, as pendentes são concluídas antes de fechar o pool.
+DB_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+atexit.register(DB_WRITER.shutdown)
+
+def _report_db_error(future):
+    exc = future.exception()
+    if exc:
+        print(f"Falha ao acessar o BD: {exc}", file=sys.stderr)
+
+def db_write_async(func, *args):
+    """Agenda func(*args) na thread de escrita e retorna o Future."""
+    future = DB_WRITER.submit(func, *args)
+    future.add_done_callback(_report_db_error)
+    return future
 
 def db_init():
     """Cria as tabelas se não existirem."""
@@ -45,14 +179,73 @@ def db_init():
                     date TIMESTAMP DEFAULT now()
                 );
             """)
+            # O ranking (ORDER BY score DESC LIMIT n) vira uma leitura só do
+            # índice (username vai junto no INCLUDE), sem ordenar a tabela nem
+            # visitar as linhas.
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS scores_score_username_idx
+                ON scores (score DESC) INCLUDE (username);
+            """)
+            # Só quem pontuou no dia entra no índice: o reset do fim do dia
+            # (WHERE daily_score <> 0) acha essas linhas sem varrer a tabela
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS users_daily_score_idx
+                ON users (daily_score DESC)
+                WHERE daily_score <> 0;
+            """)
+            # Estado global do jogo em pares chave/valor (ex.: owner_balance)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS game_state (
+                    k TEXT PRIMARY KEY,
+                    v INT NOT NULL
+                );
+            """)
+            # Pot do dia, para não se perder ao reiniciar o jogo
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS daily_state (
+                    day DATE PRIMARY KEY,
+                    pot INT NOT NULL DEFAULT 0
+                );
+            """)
             conn.commit()
 
+# Cache em memória das linhas de users: username -> (instante da leitura, linha).
+# Só a thread principal mexe nele; a fila de escrita nunca o atualiza.
+USER_CACHE_TTL = 5.0  # segundos
+_USER_CACHE = {}
+
+# Última escrita enfileirada de cada usuário. A fila tem um único worker, então
+# quando ela termina todas as anteriores do mesmo usuário também terminaram.
+_LAST_WRITE = {}
+
+def _cache_user(user):
+    _USER_CACHE[user["username"]] = (time.monotonic(), dict(user))
+
+def _writes_pending(username):
+    future = _LAST_WRITE.get(username)
+    return future is not None and not future.done()
+
 def db_get_user(username):
+    """Lê o usuário do banco, servindo do cache se a leitura tiver menos de USER_CACHE_TTL s.
+
+    Com escritas do usuário ainda na fila, o cache (que já as reflete) não
+    expira; sem ele, a leitura espera a fila para não ver a linha antiga.
+    """
+    cached = _USER_CACHE.get(username)
+    pending = _writes_pending(username)
+    if cached and (pending or time.monotonic() - cached[0] < USER_CACHE_TTL):
+        return dict(cached[1])
+    if pending:
+        _LAST_WRITE[username].exception()  # espera sem levantar; o erro já foi reportado
+
     with db_connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT * FROM users WHERE username = %s", (username,))
+            db_execute(cur, "get_user", (username,))
             row = cur.fetchone()
-            return dict(row) if row else None
+            if not row:
+                return None
+            _cache_user(row)
+            return dict(row)
 
 def db_create_user(username, initial_balance=100):
     with db_connect() as conn:
@@ -69,50 +262,173 @@ def db_create_user(username, initial_balance=100):
                 0   # double_jump
             ))
             conn.commit()
-
-def db_update_user(user):
-    """Atualiza os dados do usuário no banco. Chamado apenas pontualmente, não no loop."""
+    _cache_user({
+        "username": username,
+        "balance": initial_balance,
+        "daily_score": 0,
+        "high_score": 0,
+        "shield": 0,
+        "double_jump": 0
+    })
+
+def db_update_user(username, balance=0, shield=0, double_jump=0, daily_score=0, high_score=0):
+    """Aplica uma mudança no usuário: saldo e itens como deltas, scores só sobem.
+
+    Nunca reescreve a linha inteira, então uma cópia velha não desfaz escritas
+    mais novas (nem de outro cliente). Chamado apenas pontualmente, não no loop.
+    """
     with db_connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                UPDATE users
-                SET balance = %s,
-                    daily_score = %s,
-                    high_score = %s,
-                    shield = %s,
-                    double_jump = %s
-                WHERE username = %s
-            """, (
-                user["balance"],
-                user["daily_score"],
-                user["high_score"],
-                user["shield"],
-                user["double_jump"],
-                user["username"]
-            ))
-            conn.commit()
-
-def db_save_score(username, score):
-    """Salva um score na tabela scores (chamado apenas no final da partida)."""
+            db_execute(cur, "update_user", (balance, daily_score, high_score, shield, double_jump, username))
+
+def _queue_user_write(username, func, *args):
+    future = db_write_async(func, *args)
+    _LAST_WRITE[username] = future
+    return future
+
+def _apply_to_cache(username, changes):
+    """Aplica na linha em cache a mesma mudança que vai para a fila (mantém o instante da leitura)."""
+    cached = _USER_CACHE.get(username)
+    if cached:
+        user = dict(cached[1])
+        for key in ("balance", "shield", "double_jump"):
+            user[key] += changes.get(key, 0)
+        for key in ("daily_score", "high_score"):
+            user[key] = max(user[key], changes.get(key, 0))
+        _USER_CACHE[username] = (cached[0], user)
+
+def db_update_user_async(username, **changes):
+    """Como db_update_user, sem bloquear: o cache já reflete a mudança e a escrita vai para a fila."""
+    _apply_to_cache(username, changes)
+    return _queue_user_write(username, functools.partial(db_update_user, username, **changes))
+
+def db_finalize_session(username, score):
+    """Registra o score da partida e sobe daily_score/high_score num único comando.
+
+    O GREATEST fica com o Postgres: sem ler o usuário antes e sem sobrescrever
+    saldo ou itens com uma cópia velha.
+    """
     with db_connect() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                INSERT INTO scores (username, score)
-                VALUES (%s, %s)
-            """, (username, score))
-            conn.commit()
+            # Score de partida não é dinheiro: o commit não precisa esperar o
+            # WAL ser gravado em disco (vale só para esta transação)
+            cur.execute("SET LOCAL synchronous_commit = OFF")
+            db_execute(cur, "finalize_session", (score, score, username, username, score))
+
+def db_finalize_session_async(username, score):
+    """Como db_finalize_session, pela fila; o cache sobe os scores na hora."""
+    _apply_to_cache(username, {"daily_score": score, "high_score": score})
+    # A próxima consulta do ranking entra na fila depois deste score
+    invalidate_ranking()
+    return _queue_user_write(username, db_finalize_session, username, score)
 
 def db_get_top_scores(limit=10):
+    with db_connect() as conn:
+        with conn.cursor(cursor_factory=TUPLE_CURSOR) as cur:
+            db_execute(cur, "top_scores", (limit,))
+            return [{"name": name, "score": score} for name, score in cur.fetchall()]
+
+# Ranking global em cache: a tela lê daqui e nunca espera pelo banco. Só a
+# thread principal altera _ranking: o worker devolve as linhas no Future.
+# ts é None enquanto o ranking nunca foi pedido ou foi invalidado.
+RANKING_SIZE = 10
+RANKING_TTL  = 60.0  # segundos
+_ranking = {"data": None, "ts": None, "pending": None}
+
+def get_ranking():
+    """Retorna o ranking em cache (None se ainda não carregou).
+
+    Aplica a consulta que já terminou e, se o ranking tiver mais de
+    RANKING_TTL s, agenda outra em segundo plano.
+    """
+    pending = _ranking["pending"]
+    if pending is not None and pending.done():
+        _ranking["pending"] = None
+        if pending.exception() is None:
+            _ranking["data"] = pending.result()
+    ts = _ranking["ts"]
+    now = time.monotonic()
+    if _ranking["pending"] is None and (ts is None or now - ts >= RANKING_TTL):
+        # Marca a hora do pedido: se a consulta falhar, só tenta de novo após o TTL
+        _ranking["ts"] = now
+        _ranking["pending"] = db_write_async(db_get_top_scores, RANKING_SIZE)
+    return _ranking["data"]
+
+def invalidate_ranking():
+    """Força a próxima leitura do ranking a buscá-lo de novo no banco."""
+    _ranking["ts"] = None
+
+def db_add_to_pot(amount):
+    """Soma amount ao pot do dia (cria a linha do dia se preciso)."""
     with db_connect() as conn:
         with conn.cursor() as cur:
+            db_execute(cur, "add_to_pot", (amount,))
+
+def db_settle_day():
+    """Fecha o dia numa única transação: apaga os pots em aberto no daily_state,
+    paga metade a quem tem o maior daily_score e o resto ao dono, e zera os
+    daily_score (só reescreve quem pontuou).
+
+    Os valores saem do pot gravado no BD, não da cópia local (que pode estar
+    velha ou não ter as jogadas de outros clientes).
+
+    Retorna (vencedor, score, prêmio, parte do dono, saldo do dono), ou None
+    se ninguém pontuou.
+    """
+    with db_connect() as conn:
+        with conn.cursor(cursor_factory=TUPLE_CURSOR) as cur:
+            # O vencedor sai do índice parcial de daily_score. Todas as partes
+            # do WITH veem o mesmo snapshot, então o reset pula o vencedor, que
+            # já é zerado no próprio pagamento (uma linha só pode ser alterada
+            # uma vez por comando). O DELETE do pot roda mesmo sem vencedor.
             cur.execute("""
-                SELECT username, score
-                FROM scores
-                ORDER BY score DESC
-                LIMIT %s
-            """, (limit,))
-            rows = cur.fetchall()
-            return [{"name": r["username"], "score": r["score"]} for r in rows]
+                WITH pot AS (
+                    DELETE FROM daily_state
+                    WHERE day <= CURRENT_DATE
+                    RETURNING pot
+                ), total AS (
+                    SELECT COALESCE(SUM(pot), 0) AS pot FROM pot
+                ), winner AS (
+                    SELECT username, daily_score
+                    FROM users
+                    WHERE daily_score <> 0
+                    ORDER BY daily_score DESC
+                    LIMIT 1
+                ), paid AS (
+                    UPDATE users
+                    SET balance = users.balance + total.pot / 2,
+                        daily_score = 0
+                    FROM winner, total
+                    WHERE users.username = winner.username
+                    RETURNING users.username, winner.daily_score,
+                              total.pot / 2 AS reward, total.pot - total.pot / 2 AS owner_cut
+                ), reset AS (
+                    UPDATE users
+                    SET daily_score = 0
+                    WHERE daily_score <> 0
+                      AND username NOT IN (SELECT username FROM winner)
+                ), credited AS (
+                    INSERT INTO game_state (k, v)
+                    SELECT 'owner_balance', owner_cut FROM paid
+                    ON CONFLICT (k) DO UPDATE SET v = game_state.v + EXCLUDED.v
+                    RETURNING v
+                )
+                SELECT paid.username, paid.daily_score, paid.reward, paid.owner_cut, credited.v
+                FROM paid, credited;
+            """)
+            row = cur.fetchone()
+    return row
+
+def db_get_daily_pot():
+    """Retorna o pot ainda não fechado (0 se ninguém jogou desde o último fechamento).
+
+    O fechamento é manual: um pot que virou a meia-noite continua em aberto e
+    entra na conta até o próximo db_settle_day.
+    """
+    with db_connect() as conn:
+        with conn.cursor(cursor_factory=TUPLE_CURSOR) as cur:
+            db_execute(cur, "daily_pot", ())
+            return cur.fetchone()[0]
 
 db_init()  # Cria tabelas se não existirem
 
@@ -122,13 +438,29 @@ db_init()  # Cria tabelas se não existirem
 WIDTH, HEIGHT = 800, 600
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("JumpAndWin: 💸")
+# Único ponto de encerramento do pygame. Os handlers do atexit rodam na ordem
+# inversa do registro: a janela fecha antes de esperar as escritas pendentes.
+atexit.register(pygame.quit)
 
 clock = pygame.time.Clock()
 FPS = 60
-
-TITLE_FONT = pygame.font.SysFont("Arial", 48, bold=True)
-FONT = pygame.font.SysFont("Arial", 24)
-SMALL_FONT = pygame.font.SysFont("Arial", 18)
+IDLE_FPS = 30  # telas sem animação (login, loja, ranking, tutorial)
+
+# Só entram na fila os eventos que as telas tratam; MOUSEMOTION e afins são
+# descartados pelo SDL (o hover dos botões usa pygame.mouse.get_pos()).
+# Os de exposição avisam show_message que a janela precisa ser reapresentada.
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+pygame.event.set_blocked(None)
+# TEXTINPUT traz o texto digitado (acentos, composição do layout/IME, teclado do Android)
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEBUTTONDOWN, *EXPOSE_EVENTS])
+
+# pygame.freetype rasteriza mais rápido que pygame.font; com pad=True as
+# superfícies têm a altura da linha inteira, como no módulo antigo.
+TITLE_FONT = pygame.freetype.SysFont("Arial", 48, bold=True)
+FONT = pygame.freetype.SysFont("Arial", 24)
+SMALL_FONT = pygame.freetype.SysFont("Arial", 18)
+for _font in (TITLE_FONT, FONT, SMALL_FONT):
+    _font.pad = True
 
 WHITE  = (255, 255, 255)
 BLACK  = (0, 0, 0)
@@ -163,20 +495,104 @@ powerup_sound = None
 #     pass
 
 # Música de fundo (desabilitada se não houver arquivo real)
-try:
-    mixer.music.load("assets/menu_music.wav")  # Se não existir, cairá no except
-except:
-    pass
+MENU_MUSIC = "assets/menu_music.wav"
+GAME_MUSIC = "assets/game_music.wav"
+_missing_music = set()  # faixas que já falharam ao carregar
+_music = {"current": None}  # faixa tocando agora
+
+def play_music(path):
+    """Toca a faixa em loop; se o arquivo não existir, não tenta carregá-lo de novo.
+
+    Se a faixa já estiver tocando (ex.: voltar da loja para o menu), não a
+    recarrega do disco nem a reinicia.
+    """
+    if path in _missing_music:
+        return
+    if _music["current"] == path and mixer.music.get_busy():
+        return
+    try:
+        mixer.music.load(path)
+        mixer.music.play(-1)
+        _music["current"] = path
+    except (pygame.error, FileNotFoundError):
+        _missing_music.add(path)
 
-# Pot diário e dono do jogo
+# Pot diário e dono do jogo. daily_pot é a cópia local do pot em aberto em
+# daily_state: alterado na hora e gravado pela fila de escrita. O vencedor do dia é quem tem
+# o maior daily_score no BD, apurado só no fechamento (db_settle_day).
 daily_pot = 0
-daily_winner = None  # (username, score)
-owner_balance = 0
+owner_balance = 0  # cópia do game_state do BD, atualizada a cada fechamento do dia
+
+DAILY_STATE_TTL = 30.0  # segundos
+# Releitura de daily_state em andamento na fila. Só a thread principal altera
+# daily_pot: o worker devolve o valor lido, aplicado em refresh_daily_state(),
+# somado ao que foi adicionado localmente depois do pedido. ts é None enquanto
+# o pot nunca foi lido ou precisa ser relido (ex.: depois do fechamento).
+_daily_state = {"ts": None, "future": None, "added": 0}
+
+def refresh_daily_state():
+    """Aplica a releitura que já terminou e agenda outra se a cópia local tiver mais de DAILY_STATE_TTL s."""
+    global daily_pot
+    future = _daily_state["future"]
+    if future is not None and future.done():
+        _daily_state["future"] = None
+        if future.exception() is None:
+            daily_pot = future.result() + _daily_state["added"]
+    ts = _daily_state["ts"]
+    now = time.monotonic()
+    if _daily_state["future"] is None and (ts is None or now - ts >= DAILY_STATE_TTL):
+        _daily_state.update(ts=now, added=0)
+        _daily_state["future"] = db_write_async(db_get_daily_pot)
+
+def add_to_daily_pot(amount):
+    """Soma amount ao pot local na hora; a gravação vai para a fila."""
+    global daily_pot
+    daily_pot += amount
+    _daily_state["added"] += amount
+    db_write_async(db_add_to_pot, amount)
+
+def reset_daily_pot():
+    """Zera o pot local depois do fechamento e descarta releituras anteriores a ele."""
+    global daily_pot
+    daily_pot = 0
+    _daily_state.update(ts=None, future=None, added=0)
 
 # ----------------------------------------------
 # 3) CLASSES E FUNÇÕES AUXILIARES
 # ----------------------------------------------
+@functools.lru_cache(maxsize=512)
+def render_text(font, text, color):
+    """Renderiza texto com cache: a mesma string não é rasterizada de novo a cada frame."""
+    # Convertida para o formato da tela, a superfície não é reconvertida a cada blit
+    return font.render(text, color)[0].convert_alpha()
+
+def _title(text):
+    """Título de tela já renderizado e centralizado no topo: (superfície, posição)."""
+    surf = render_text(TITLE_FONT, text, YELLOW)
+    return surf, (WIDTH//2 - surf.get_width()//2, 80)
+
+# Títulos fixos das telas, renderizados uma única vez no carregamento
+GAME_TITLE    = _title("JumpAndWin: 💸")
+SHOP_TITLE    = _title("Loja")
+RANKING_TITLE = _title("Ranking Global")
+
+# Sprites de partícula por (tamanho, cor); o alpha é aplicado na hora do blit
+_PARTICLE_CACHE = {}
+
+def _particle_sprite(size, color):
+    """Devolve o círculo pré-desenhado de uma partícula, criando-o se preciso."""
+    sprite = _PARTICLE_CACHE.get((size, color))
+    if sprite is None:
+        if len(_PARTICLE_CACHE) >= 256:
+            _PARTICLE_CACHE.clear()
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (size//2, size//2), size//2)
+        sprite = _PARTICLE_CACHE[(size, color)] = sprite.convert_alpha()
+    return sprite
+
 class Particle:
+    __slots__ = ("x", "y", "color", "vel_x", "vel_y", "size", "gravity", "life", "sprite")
+
     def __init__(self, x, y, color, vel_x=None, vel_y=None, size=None, gravity=None):
         self.x = x
         self.y = y
@@ -186,6 +602,8 @@ class Particle:
         self.size  = random.randint(2, 8) if size is None else size
         self.gravity = 0.2 if gravity is None else gravity
         self.life  = random.randint(20, 60)
+        # Cor e tamanho não mudam: o sprite é buscado uma vez, não a cada frame
+        self.sprite = _particle_sprite(self.size, self.color)
 
     def update(self):
         self.vel_y += self.gravity
@@ -194,10 +612,15 @@ class Particle:
         self.life -= 1
 
     def draw(self, surface):
-        alpha = min(255, self.life * 4)
-        s = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, alpha), (self.size//2, self.size//2), self.size//2)
-        surface.blit(s, (int(self.x), int(self.y)))
+        self.sprite.set_alpha(min(255, self.life * 4))
+        surface.blit(self.sprite, (int(self.x), int(self.y)))
+
+def _make_button_bg(color, w, h):
+    """Pré-desenha o fundo arredondado (com borda) de um botão."""
+    bg = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(bg, color, bg.get_rect(), border_radius=10)
+    pygame.draw.rect(bg, BLACK, bg.get_rect(), 2, border_radius=10)
+    return bg.convert_alpha()
 
 class Button:
     def __init__(self, x, y, w, h, text, color=(100,100,100), hover_color=(150,150,150), text_color=WHITE):
@@ -206,119 +629,213 @@ class Button:
         self.color       = color
         self.hover_color = hover_color
         self.text_color  = text_color
-        self.active_color= color
+
+        # Texto e fundos não mudam: renderiza tudo uma vez só
+        self.text_surf = render_text(FONT, text, text_color)
+        self.text_rect = self.text_surf.get_rect(center=self.rect.center)
+        self.normal_bg = _make_button_bg(color, w, h)
+        self.hover_bg  = _make_button_bg(hover_color, w, h)
 
     def draw(self, surface):
         mouse_pos = pygame.mouse.get_pos()
-        if self.rect.collidepoint(mouse_pos):
-            self.active_color = self.hover_color
-        else:
-            self.active_color = self.color
-
-        pygame.draw.rect(surface, self.active_color, self.rect, border_radius=10)
-        pygame.draw.rect(surface, BLACK, self.rect, 2, border_radius=10)
-
-        text_surf = FONT.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surface.blit(text_surf, text_rect)
+        bg = self.hover_bg if self.rect.collidepoint(mouse_pos) else self.normal_bg
+        surface.blit(bg, self.rect)
+        surface.blit(self.text_surf, self.text_rect)
 
     def is_clicked(self, event):
         return (event.type == pygame.MOUSEBUTTONDOWN and
                 event.button == 1 and
                 self.rect.collidepoint(event.pos))
 
+def hovered_buttons(buttons):
+    """Quais botões estão sob o mouse: as telas estáticas só redesenham quando
+    isso muda ou quando chega algum evento."""
+    mouse_pos = pygame.mouse.get_pos()
+    return tuple(btn.rect.collidepoint(mouse_pos) for btn in buttons)
+
 def draw_cloud(surface, x, y):
-    pygame.draw.ellipse(surface, WHITE, (x, y, 60, 30))
-    pygame.draw.ellipse(surface, WHITE, (x+20, y-10, 40, 30))
-    pygame.draw.ellipse(surface, WHITE, (x+10, y+5, 50, 25))
+    r = pygame.draw.ellipse(surface, WHITE, (x, y, 60, 30))
+    return r.unionall([
+        pygame.draw.ellipse(surface, WHITE, (x+20, y-10, 40, 30)),
+        pygame.draw.ellipse(surface, WHITE, (x+10, y+5, 50, 25)),
+    ])
 
 def draw_tree(surface, x, y):
-    pygame.draw.rect(surface, (139,69,19), (x-5, y-50, 10, 50))
-    pygame.draw.circle(surface, (34,139,34), (x, y-60), 25)
-    pygame.draw.circle(surface, (34,139,34), (x-15, y-40), 20)
-    pygame.draw.circle(surface, (34,139,34), (x+15, y-40), 20)
+    r = pygame.draw.rect(surface, (139,69,19), (x-5, y-50, 10, 50))
+    return r.unionall([
+        pygame.draw.circle(surface, (34,139,34), (x, y-60), 25),
+        pygame.draw.circle(surface, (34,139,34), (x-15, y-40), 20),
+        pygame.draw.circle(surface, (34,139,34), (x+15, y-40), 20),
+    ])
 
 def draw_cactus(surface, x, y):
-    pygame.draw.rect(surface, (50,205,50), (x-5, y-60, 10, 60))
-    pygame.draw.rect(surface, (50,205,50), (x-5, y-45, -15, 8))
-    pygame.draw.rect(surface, (50,205,50), (x+5, y-30, 15, 8))
-
-def draw_background(surface, score):
-    """Desenha fundo com base na 'phase' calculada pelo score."""
-    phase = ((score // 10) % 10) + 1
-    phase_colors = [
-        [(173,216,230), WHITE],
-        [(144,238,144), (220,255,220)],
-        [(255,165,0),   (255,215,0)],
-        [(139,0,0),     (80,0,0)],
-        [(135,206,250), (240,248,255)],
-        [(152,251,152), (240,255,240)],
-        [(255,192,203), (255,228,225)],
-        [(221,160,221), (238,130,238)],
-        [(255,218,185), (255,228,196)],
-        [(192,192,192), (255,250,250)]
-    ]
-    top_color, bottom_color = phase_colors[phase - 1]
-
+    r = pygame.draw.rect(surface, (50,205,50), (x-5, y-60, 10, 60))
+    return r.unionall([
+        pygame.draw.rect(surface, (50,205,50), (x-5, y-45, -15, 8)),
+        pygame.draw.rect(surface, (50,205,50), (x+5, y-30, 15, 8)),
+    ])
+
+def _make_decoration(draw_func, w, h, anchor):
+    """Pré-desenha uma decoração numa Surface; `anchor` é o ponto (x, y) passado a draw_func."""
+    sprite = pygame.Surface((w, h), pygame.SRCALPHA)
+    draw_func(sprite, *anchor)
+    return sprite.convert_alpha(), anchor
+
+# Decorações de fundo renderizadas uma única vez: (sprite, âncora)
+CLOUD_DECORATION  = _make_decoration(draw_cloud,  60, 40, (0, 10))
+TREE_DECORATION   = _make_decoration(draw_tree,   70, 85, (35, 85))
+CACTUS_DECORATION = _make_decoration(draw_cactus, 40, 60, (20, 60))
+
+def place_decoration(decoration, x, y):
+    """(sprite, posição) de uma decoração pré-renderizada com a âncora em (x, y)."""
+    sprite, (ax, ay) = decoration
+    return sprite, (x - ax, y - ay)
+
+# Paleta (topo, base) do degradê de cada uma das 10 fases
+PHASE_COLORS = (
+    ((173,216,230), WHITE),
+    ((144,238,144), (220,255,220)),
+    ((255,165,0),   (255,215,0)),
+    ((139,0,0),     (80,0,0)),
+    ((135,206,250), (240,248,255)),
+    ((152,251,152), (240,255,240)),
+    ((255,192,203), (255,228,225)),
+    ((221,160,221), (238,130,238)),
+    ((255,218,185), (255,228,196)),
+    ((192,192,192), (255,250,250))
+)
+
+# Fundos estáticos (degradê + chão) já renderizados, indexados pela fase
+_BG_CACHE = {}
+
+def get_phase(score):
+    """Fase (1 a 10) correspondente ao score; o ciclo se repete a cada 100 pontos."""
+    return ((score // 10) % 10) + 1
+
+def _build_gradient(top_color, bottom_color):
+    """Renderiza uma única vez o degradê vertical de uma fase."""
+    # Calcula só uma coluna de 1px e deixa o SDL esticá-la na horizontal
+    column = pygame.Surface((1, HEIGHT))
     for y in range(HEIGHT):
         ratio = y / HEIGHT
         r = int(top_color[0]*(1 - ratio) + bottom_color[0]*ratio)
         g = int(top_color[1]*(1 - ratio) + bottom_color[1]*ratio)
         b = int(top_color[2]*(1 - ratio) + bottom_color[2]*ratio)
-        pygame.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
-
-    # Elementos de fundo
-    if phase % 4 == 1:
-        # Nuvens
-        if random.random() < 0.02:  # reduz chance
-            cx = (pygame.time.get_ticks()//50 + random.randint(0,WIDTH)) % (WIDTH+200) - 100
-            cy = random.randint(50,150)
-            draw_cloud(surface, cx, cy)
-    elif phase % 4 == 2:
-        # Árvores
-        if random.random() < 0.02:
-            tx = (pygame.time.get_ticks()//80) % WIDTH
-            ty = HEIGHT - 100
-            draw_tree(surface, tx, ty)
-    elif phase % 4 == 3:
-        # Cactos
-        if random.random() < 0.02:
-            cx = (pygame.time.get_ticks()//60) % WIDTH
-            cy = HEIGHT - 100
-            draw_cactus(surface, cx, cy)
+        column.set_at((0, y), (r, g, b))
+    return pygame.transform.scale(column, (WIDTH, HEIGHT)).convert()
+
+def _phase_background(phase):
+    """Devolve o fundo estático de uma fase, renderizando-o na primeira vez."""
+    bg = _BG_CACHE.get(phase)
+    if bg is None:
+        bg = _build_gradient(*PHASE_COLORS[phase - 1])
+        ground_color = (100,70,40) if phase < 4 else (50,0,0)
+        pygame.draw.rect(bg, ground_color, (0, HEIGHT-50, WIDTH, 50))
+        _BG_CACHE[phase] = bg
+    return bg
+
+LAVA_HEIGHT    = 50
+LAVA_AMPLITUDE = 10
+LAVA_PERIOD    = 2*math.pi / 0.05  # comprimento da onda de lava, em pixels
+_lava_strip = None
+
+def _build_lava_strip():
+    """Desenha a lava com um período extra de largura, pronta para rolar."""
+    strip = pygame.Surface((WIDTH + math.ceil(LAVA_PERIOD), LAVA_HEIGHT + LAVA_AMPLITUDE), pygame.SRCALPHA)
+    w, h = strip.get_size()
+    # Um único polígono: a crista da onda, pixel a pixel, fechada pelo fundo
+    crest = [(x, LAVA_AMPLITUDE + int(math.sin(x*0.05)*LAVA_AMPLITUDE)) for x in range(w)]
+    pygame.draw.polygon(strip, (255,69,0), crest + [(w - 1, h - 1), (0, h - 1)])
+    return strip.convert_alpha()
+
+def _clouds(now):
+    """Nuvens (fases 1, 5, 9)."""
+    if random.random() < 0.02:  # reduz chance
+        cx = (now//50 + random.randint(0,WIDTH)) % (WIDTH+200) - 100
+        cy = random.randint(50,150)
+        return place_decoration(CLOUD_DECORATION, cx, cy)
+    return None
+
+def _trees(now):
+    """Árvores (fases 2, 6, 10)."""
+    if random.random() < 0.02:
+        tx = (now//80) % WIDTH
+        ty = HEIGHT - 100
+        return place_decoration(TREE_DECORATION, tx, ty)
+    return None
+
+def _cacti(now):
+    """Cactos (fases 3, 7)."""
+    if random.random() < 0.02:
+        cx = (now//60) % WIDTH
+        cy = HEIGHT - 100
+        return place_decoration(CACTUS_DECORATION, cx, cy)
+    return None
+
+def _lava(now):
+    """Lava (fases 4, 8): a onda só se desloca no tempo, então rolamos a faixa
+    pré-desenhada. Só a crista acima do chão fica visível, então só ela é copiada."""
+    global _lava_strip
+    if _lava_strip is None:
+        _lava_strip = _build_lava_strip()
+    offset = int((now/200) % LAVA_PERIOD)
+    return (_lava_strip.subsurface((offset, 0, WIDTH, LAVA_AMPLITUDE)),
+            (0, HEIGHT - LAVA_HEIGHT - LAVA_AMPLITUDE))
+
+# Elementos de fundo animados de cada fase, indexados por phase - 1; recebem o
+# instante do frame (ms) e devolvem (sprite, posição) ou None
+PHASE_DECORATORS = ([_clouds, _trees, _cacti, _lava] * 3)[:10]
+
+def draw_background(surface, score, now, areas=None, keep=None):
+    """Desenha fundo com base na 'phase' calculada pelo score; `now` é o
+    instante do frame (pygame.time.get_ticks()), que anima os elementos.
+
+    Se `areas` for informado, só essas regiões do fundo estático são restauradas.
+    `keep` é uma área desenhada por cima depois (o HUD): se a decoração do
+    frame cair sobre ela, o fundo ali também é restaurado antes da decoração.
+    Retorna os retângulos dos elementos animados desenhados neste frame.
+    """
+    phase = get_phase(score)
+    decoration = PHASE_DECORATORS[phase - 1](now)
+
+    # Degradê e chão são estáticos por fase: desenha uma vez e depois só faz blit
+    bg = _phase_background(phase)
+    if areas is None:
+        surface.blit(bg, (0, 0))
     else:
-        # Lava
-        lava_height = 50
-        lava_y = HEIGHT - lava_height
-        for x in range(0, WIDTH, 4):
-            wave = math.sin((x + pygame.time.get_ticks()/200)*0.05)*10
-            pygame.draw.rect(surface, (255,69,0), (x, lava_y+wave, 4, lava_height-wave))
+        if keep and decoration and keep.colliderect(decoration[0].get_rect(topleft=decoration[1])):
+            areas = areas + [keep]
+        for area in areas:
+            surface.blit(bg, area, area)
 
-    ground_color = (100,70,40) if phase < 4 else (50,0,0)
-    pygame.draw.rect(surface, ground_color, (0, HEIGHT-50, WIDTH, 50))
+    return [surface.blit(*decoration)] if decoration else []
 
 def show_message(message, sub_message=""):
-    waiting = True
-    while waiting:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                waiting = False
+    """Mostra a mensagem até o jogador apertar ENTER.
 
-        screen.fill((30,30,60))
-        lines = message.split('\n')
-        for i, line in enumerate(lines):
-            text = FONT.render(line, True, WHITE)
-            screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 40 + i*30))
+    Desenha uma única vez e dorme em event.wait() em vez de redesenhar a 60 FPS;
+    só reapresenta a tela quando a janela é exposta de novo.
+    """
+    screen.fill((30,30,60))
+    lines = message.split('\n')
+    for i, line in enumerate(lines):
+        text = render_text(FONT, line, WHITE)
+        screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 40 + i*30))
 
-        if sub_message:
-            subtext = SMALL_FONT.render(sub_message, True, WHITE)
-            screen.blit(subtext, (WIDTH//2 - subtext.get_width()//2, HEIGHT//2 + 40))
+    if sub_message:
+        subtext = render_text(SMALL_FONT, sub_message, WHITE)
+        screen.blit(subtext, (WIDTH//2 - subtext.get_width()//2, HEIGHT//2 + 40))
 
-        pygame.display.flip()
+    pygame.display.flip()
+
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            sys.exit()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            return
+        if event.type in EXPOSE_EVENTS:
+            pygame.display.flip()
 
 # ----------------------------------------------
 # 4) TELA DE LOGIN / CRIAÇÃO DE USUÁRIO
@@ -332,12 +849,13 @@ def login_screen():
     error_message = ""
     login_mode = True
     initial_balance = 100
+    drawn_hover = None
 
     while True:
-        clock.tick(FPS)
-        for event in pygame.event.get():
+        clock.tick(IDLE_FPS)
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
                 sys.exit()
 
             if event.type == pygame.KEYDOWN:
@@ -357,9 +875,9 @@ def login_screen():
                             return username
                 elif event.key == pygame.K_BACKSPACE:
                     username = username[:-1]
-                else:
-                    if len(username) < 12:
-                        username += event.unicode
+            elif event.type == pygame.TEXTINPUT:
+                # Um evento pode trazer mais de um caractere (ex.: composição do IME)
+                username = (username + event.text)[:12]
 
             for btn in buttons:
                 if btn.is_clicked(event):
@@ -368,20 +886,25 @@ def login_screen():
                     elif btn.text == "Novo Usuário":
                         login_mode = False
 
+        # Nada mudou desde o último frame desenhado: não redesenha nem apresenta
+        hover = hovered_buttons(buttons)
+        if not events and hover == drawn_hover:
+            continue
+        drawn_hover = hover
+
         screen.fill((30,30,60))
-        title = TITLE_FONT.render("JumpAndWin: 💸", True, YELLOW)
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 80))
+        screen.blit(*GAME_TITLE)
 
         prompt_text = "Entre com seu nome para logar:" if login_mode else "Crie seu nome para cadastrar:"
-        pt_surf = FONT.render(prompt_text, True, WHITE)
+        pt_surf = render_text(FONT, prompt_text, WHITE)
         screen.blit(pt_surf, (WIDTH//2 - pt_surf.get_width()//2, HEIGHT//2 - 50))
 
         pygame.draw.rect(screen, WHITE, (WIDTH//2 - 150, HEIGHT//2 - 20, 300, 40), border_radius=5)
-        user_surf = FONT.render(username, True, BLACK)
+        user_surf = render_text(FONT, username, BLACK)
         screen.blit(user_surf, (WIDTH//2 - 140, HEIGHT//2 - 10))
 
         if error_message:
-            err_surf = FONT.render(error_message, True, RED)
+            err_surf = render_text(FONT, error_message, RED)
             screen.blit(err_surf, (WIDTH//2 - err_surf.get_width()//2, HEIGHT//2 + 30))
 
         for btn in buttons:
@@ -401,17 +924,22 @@ def main_menu(username):
         Button(WIDTH//2 - 120, 480, 240, 50, "Sair", RED)
     ]
     particles = []
-    try:
-        mixer.music.load("assets/menu_music.wav")
-        mixer.music.play(-1)
-    except:
-        pass
+    play_music(MENU_MUSIC)
+
+    # Lido uma vez por visita ao menu: jogo, loja e fim do dia voltam por aqui
+    # depois de alterar o usuário, e então a leitura é refeita
+    user_data = db_get_user(username)
+    info_surf = None
+    if user_data:
+        info_surf = render_text(FONT, f"Jogador: {user_data['username']} | Saldo: {user_data['balance']}", WHITE)
+    # O pot pode mudar com a releitura em segundo plano: re-renderiza só quando muda
+    shown_pot = pot_surf = None
 
     while True:
         clock.tick(FPS)
+        refresh_daily_state()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
                 sys.exit()
 
             for btn in buttons:
@@ -426,24 +954,25 @@ def main_menu(username):
                 (random.randint(100,255), random.randint(100,255), random.randint(100,255)),
                 gravity=0
             ))
-        for p in particles[:]:
+        alive = []
+        for p in particles:
             p.update()
-            if p.life <= 0:
-                particles.remove(p)
+            if p.life > 0:
+                alive.append(p)
+        particles = alive
 
         screen.fill((30,30,60))
         for p in particles:
             p.draw(screen)
 
-        title = TITLE_FONT.render("JumpAndWin: 💸", True, YELLOW)
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 80))
+        screen.blit(*GAME_TITLE)
 
         # Exibe dados do usuário
-        user_data = db_get_user(username)
-        if user_data:
-            info_surf = FONT.render(f"Jogador: {user_data['username']} | Saldo: {user_data['balance']}", True, WHITE)
+        if info_surf:
             screen.blit(info_surf, (20, 20))
-        pot_surf = FONT.render(f"Prêmio do Dia: {daily_pot}", True, YELLOW)
+        if daily_pot != shown_pot:
+            shown_pot = daily_pot
+            pot_surf = render_text(FONT, f"Prêmio do Dia: {daily_pot}", YELLOW)
         screen.blit(pot_surf, (WIDTH - pot_surf.get_width() - 20, 20))
 
         for btn in buttons:
@@ -463,11 +992,15 @@ def shop_screen(username):
     for i, item in enumerate(shop_items):
         buttons.append(Button(WIDTH//2 + 120, 200 + i*100, 150, 40, f"Comprar ({item['price']})", item["color"]))
 
+    # Lido uma vez: a tela e as compras usam esta cópia, gravada a cada compra
+    user_data = db_get_user(username)
+    drawn_hover = None
+
     while True:
-        clock.tick(FPS)
-        for event in pygame.event.get():
+        clock.tick(IDLE_FPS)
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
                 sys.exit()
 
             for i, btn in enumerate(buttons):
@@ -477,32 +1010,34 @@ def shop_screen(username):
                     else:
                         # Compra item
                         item = shop_items[i-1]
-                        user_data = db_get_user(username)
                         if user_data and user_data["balance"] >= item["price"]:
                             user_data["balance"] -= item["price"]
                             user_data[item["key"]] += 1
-                            db_update_user(user_data)
+                            db_update_user_async(username, balance=-item["price"], **{item["key"]: 1})
                             if powerup_sound: powerup_sound.play()
 
+        hover = hovered_buttons(buttons)
+        if not events and hover == drawn_hover:
+            continue
+        drawn_hover = hover
+
         screen.fill((30,30,60))
-        title = TITLE_FONT.render("Loja", True, YELLOW)
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 80))
+        screen.blit(*SHOP_TITLE)
 
-        user_data = db_get_user(username)
         if user_data:
-            bal_surf = FONT.render(f"Seu Saldo: {user_data['balance']}", True, WHITE)
+            bal_surf = render_text(FONT, f"Seu Saldo: {user_data['balance']}", WHITE)
             screen.blit(bal_surf, (WIDTH//2 - bal_surf.get_width()//2, 140))
 
         for i, item in enumerate(shop_items):
             pygame.draw.rect(screen, (60,60,90), (100, 200 + i*100, WIDTH-200, 80), border_radius=10)
-            name_surf = FONT.render(item['name'], True, WHITE)
-            desc_surf = SMALL_FONT.render(item['desc'], True, WHITE)
+            name_surf = render_text(FONT, item['name'], WHITE)
+            desc_surf = render_text(SMALL_FONT, item['desc'], WHITE)
 
             qty = 0
             if user_data:
                 qty = user_data[item["key"]]
 
-            qty_surf = FONT.render(f"Você tem: {qty}", True, item["color"])
+            qty_surf = render_text(FONT, f"Você tem: {qty}", item["color"])
             screen.blit(name_surf, (120, 210 + i*100))
             screen.blit(desc_surf, (120, 240 + i*100))
             screen.blit(qty_surf, (350, 210 + i*100))
@@ -515,40 +1050,55 @@ def shop_screen(username):
 # ----------------------------------------------
 # 7) TELA DE RANKING
 # ----------------------------------------------
+def _ranking_blits(top_scores):
+    """Textos da tela de ranking como pares (superfície, posição) para screen.blits()."""
+    if top_scores is None:
+        wait_surf = render_text(FONT, "Carregando ranking...", WHITE)
+        return [(wait_surf, (WIDTH//2 - wait_surf.get_width()//2, 250))]
+    if not top_scores:
+        no_surf = render_text(FONT, "Ainda não há pontuações registradas", WHITE)
+        return [(no_surf, (WIDTH//2 - no_surf.get_width()//2, 250))]
+
+    blits = [(render_text(FONT, "Pos   Jogador                  Pontuação", WHITE), (WIDTH//2 - 200, 150))]
+    for i, sc in enumerate(top_scores):
+        color = YELLOW if i<3 else WHITE
+        blits.append((render_text(FONT, f"{i+1}.", color), (WIDTH//2 - 200, 200 + i*30)))
+        blits.append((render_text(FONT, sc["name"][:20], color), (WIDTH//2 - 160, 200 + i*30)))
+        blits.append((render_text(FONT, str(sc["score"]), color), (WIDTH//2 + 150, 200 + i*30)))
+    return blits
+
 def ranking_screen():
     buttons = [Button(WIDTH//2 - 100, HEIGHT - 80, 200, 40, "Voltar ao Menu", RED)]
-    top_scores = db_get_top_scores(10)
+    # Os textos só são remontados quando get_ranking() entrega outra lista
+    shown_scores = blits = None
+    drawn_hover = None
 
     while True:
-        clock.tick(FPS)
-        for event in pygame.event.get():
+        clock.tick(IDLE_FPS)
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
                 sys.exit()
             for btn in buttons:
                 if btn.is_clicked(event):
                     return
 
-        screen.fill((30,30,60))
-        title = TITLE_FONT.render("Ranking Global", True, YELLOW)
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, 80))
+        top_scores = get_ranking()
+        changed = blits is None or top_scores is not shown_scores
+        if changed:
+            shown_scores = top_scores
+            blits = _ranking_blits(top_scores)
+
+        hover = hovered_buttons(buttons)
+        if not (events or changed) and hover == drawn_hover:
+            continue
+        drawn_hover = hover
 
+        screen.fill((30,30,60))
+        screen.blit(*RANKING_TITLE)
+        screen.blits(blits, doreturn=False)
         if top_scores:
-            header = FONT.render("Pos   Jogador                  Pontuação", True, WHITE)
-            screen.blit(header, (WIDTH//2 - 200, 150))
             pygame.draw.line(screen, WHITE, (WIDTH//2 - 200, 180), (WIDTH//2 + 200, 180))
-            for i, sc in enumerate(top_scores):
-                pos_surf = FONT.render(f"{i+1}.", True, YELLOW if i<3 else WHITE)
-                name = sc["name"][:20]
-                name_surf = FONT.render(name, True, YELLOW if i<3 else WHITE)
-                score_surf= FONT.render(str(sc["score"]), True, YELLOW if i<3 else WHITE)
-
-                screen.blit(pos_surf, (WIDTH//2 - 200, 200 + i*30))
-                screen.blit(name_surf, (WIDTH//2 - 160, 200 + i*30))
-                screen.blit(score_surf, (WIDTH//2 + 150, 200 + i*30))
-        else:
-            no_surf = FONT.render("Ainda não há pontuações registradas", True, WHITE)
-            screen.blit(no_surf, (WIDTH//2 - no_surf.get_width()//2, 250))
 
         for btn in buttons:
             btn.draw(screen)
@@ -594,16 +1144,28 @@ def tutorial_screen():
             ]
         }
     ]
+    # Cada página renderizada uma vez, como pares (superfície, posição)
+    page_blits = []
+    for n, page in enumerate(tutorial_pages):
+        blits = [_title(page["title"])]
+        for i, line in enumerate(page["text"]):
+            line_surf = render_text(FONT, line, WHITE)
+            blits.append((line_surf, (WIDTH//2 - line_surf.get_width()//2, 180 + i*40)))
+        page_surf = render_text(SMALL_FONT, f"Página {n+1}/{len(tutorial_pages)}", WHITE)
+        blits.append((page_surf, (WIDTH//2 - page_surf.get_width()//2, HEIGHT - 120)))
+        page_blits.append(blits)
+
     current_page = 0
     prev_btn = Button(150, HEIGHT - 80, 100, 40, "Anterior", BLUE)
     next_btn = Button(WIDTH - 250, HEIGHT - 80, 100, 40, "Próximo", GREEN)
 
     tutorial_active = True
+    drawn_hover = None
     while tutorial_active:
-        clock.tick(FPS)
-        for event in pygame.event.get():
+        clock.tick(IDLE_FPS)
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
                 sys.exit()
             for btn in buttons:
                 if btn.is_clicked(event):
@@ -614,17 +1176,13 @@ def tutorial_screen():
             if next_btn.is_clicked(event) and current_page < len(tutorial_pages)-1:
                 current_page += 1
 
-        screen.fill((30,30,60))
-        page = tutorial_pages[current_page]
-        title_surf = TITLE_FONT.render(page["title"], True, YELLOW)
-        screen.blit(title_surf, (WIDTH//2 - title_surf.get_width()//2, 80))
-
-        for i, line in enumerate(page["text"]):
-            line_surf = FONT.render(line, True, WHITE)
-            screen.blit(line_surf, (WIDTH//2 - line_surf.get_width()//2, 180 + i*40))
+        hover = hovered_buttons(buttons + [prev_btn, next_btn])
+        if not events and hover == drawn_hover:
+            continue
+        drawn_hover = hover
 
-        page_surf = SMALL_FONT.render(f"Página {current_page+1}/{len(tutorial_pages)}", True, WHITE)
-        screen.blit(page_surf, (WIDTH//2 - page_surf.get_width()//2, HEIGHT - 120))
+        screen.fill((30,30,60))
+        screen.blits(page_blits[current_page], doreturn=False)
 
         for btn in buttons:
             btn.draw(screen)
@@ -638,6 +1196,22 @@ def tutorial_screen():
 # ----------------------------------------------
 # 9) ENTIDADES DO JOGO (PLAYER, OBSTACLE)
 # ----------------------------------------------
+TRAIL_LENGTH = 20  # posições guardadas no rastro do player
+
+@functools.lru_cache(maxsize=None)
+def trail_sprites(color, width, height):
+    """Um sprite por nível de transparência do rastro, do mais apagado ao mais forte.
+
+    Compartilhados entre partidas: só são desenhados no primeiro Player criado.
+    """
+    sprites = []
+    for i in range(TRAIL_LENGTH):
+        alpha = int(255 * (i+1) / TRAIL_LENGTH)
+        s = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.circle(s, (*color, alpha), (width//2, height//2), width//2)
+        sprites.append(s.convert_alpha())
+    return tuple(sprites)
+
 class Player:
     def __init__(self):
         self.width  = 50
@@ -650,7 +1224,9 @@ class Player:
         self.color  = BLUE
         self.jumps_available = 1
         self.shield_active   = False
-        self.trail = []
+        self.trail = deque(maxlen=TRAIL_LENGTH)
+
+        self._trail_surfs = trail_sprites(self.color, self.width, self.height)
 
     def jump(self):
         """Salta caso esteja no chão ou tenha pulo duplo disponível."""
@@ -680,44 +1256,91 @@ class Player:
             self.on_ground = True
             self.jumps_available = 1
 
-        self.rect.topleft = (self.x, self.y)
+        # Só o y muda: atualiza o Rect no lugar, sem montar uma tupla por frame
+        self.rect.y = int(self.y)
         self.trail.append((self.x, self.y))
-        if len(self.trail) > 20:
-            self.trail.pop(0)
 
     def draw(self, surface):
-        """Desenha o rastro e o retângulo do player."""
+        """Desenha o rastro e o retângulo do player; retorna a área afetada."""
+        drawn = []
+        # A posição mais recente sempre usa o sprite mais opaco
+        first = TRAIL_LENGTH - len(self.trail)
         for i, pos in enumerate(self.trail):
-            alpha = int(255 * (i+1) / len(self.trail))
-            s = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (self.width//2, self.height//2), self.width//2)
-            surface.blit(s, pos)
+            drawn.append(surface.blit(self._trail_surfs[first + i], pos))
 
-        pygame.draw.rect(surface, self.color, self.rect, border_radius=8)
+        area = pygame.draw.rect(surface, self.color, self.rect, border_radius=8)
         if self.shield_active:
-            pygame.draw.ellipse(surface, ORANGE, (self.x-5, self.y-5, self.width+10, self.height+10), 3)
+            drawn.append(pygame.draw.ellipse(surface, ORANGE, (self.x-5, self.y-5, self.width+10, self.height+10), 3))
+        return area.unionall(drawn)
 
 class Obstacle:
+    __slots__ = ("width", "height", "x", "y", "rect")
+
     def __init__(self):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset()
+
+    def reset(self):
+        """Sorteia um novo tamanho e volta para a borda direita da tela."""
         self.width  = random.randint(20, 50)
         self.height = random.randint(20, 70)
         self.x      = WIDTH
         self.y      = HEIGHT - self.height - 50
-        self.rect   = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect.update(self.x, self.y, self.width, self.height)
 
     def update(self, current_speed):
         """Movimenta o obstáculo para a esquerda."""
         self.x -= current_speed
-        self.rect.topleft = (self.x, self.y)
+        self.rect.x = int(self.x)
 
     def draw(self, surface):
-        pygame.draw.rect(surface, RED, self.rect, border_radius=4)
+        return pygame.draw.rect(surface, RED, self.rect, border_radius=4)
+
+# Obstáculos que saíram da tela, guardados para reaproveitar no próximo spawn
+# em vez de alocar um objeto e um Rect novos a cada vez
+_free_obstacles = []
+
+def spawn_obstacle():
+    """Devolve um obstáculo novo na borda direita, reaproveitando um do pool se houver."""
+    if _free_obstacles:
+        obs = _free_obstacles.pop()
+        obs.reset()
+        return obs
+    return Obstacle()
+
+# Acima disso, enviar a tela inteira com flip() sai mais barato que atualizar
+# retângulo por retângulo
+DIRTY_RECT_LIMIT = 50
+DIRTY_AREA_LIMIT = WIDTH * HEIGHT // 2
+
+# Avisos de fim de partida, fixos: renderizados uma vez no carregamento
+GAME_OVER_BANNER = render_text(FONT, "Game Over! Press SPACE to finish.", BLACK)
+CHEAT_BANNER     = render_text(FONT, "Cheating detected! Press SPACE to finish.", RED)
+
+# Rótulos do HUD, fixos; durante a partida só os números são renderizados
+HUD_LABELS = [render_text(FONT, label, BLACK) for label in ("Score: ", "Saldo: ", "Pot: ")]
+HUD_LABEL_POS = [(10, 10), (10, 40), (10, 70)]
+HUD_VALUE_POS = [(x + label.get_width(), y) for label, (x, y) in zip(HUD_LABELS, HUD_LABEL_POS)]
+
+# Atlas dos caracteres dos números do HUD; com pad=True todos têm a altura
+# da linha e a largura do avanço, então basta colocá-los lado a lado
+HUD_GLYPHS = {ch: render_text(FONT, ch, BLACK) for ch in "-0123456789"}
+
+def render_int(value):
+    """Monta o número a partir do atlas, sem chamar o freetype durante a partida."""
+    glyphs = [HUD_GLYPHS[ch] for ch in str(value)]
+    # Já no formato da tela, como os glyphs de render_text: o blit por frame não converte nada
+    surf = pygame.Surface((sum(g.get_width() for g in glyphs), glyphs[0].get_height()), pygame.SRCALPHA).convert_alpha()
+    x = 0
+    for g in glyphs:
+        surf.blit(g, (x, 0))
+        x += g.get_width()
+    return surf
 
 # ----------------------------------------------
 # 10) LOOP PRINCIPAL DE JOGO
 # ----------------------------------------------
 def game_loop(username):
-    global daily_pot, daily_winner
     player = Player()
     obstacles = []
     spawn_timer = 0
@@ -736,41 +1359,80 @@ def game_loop(username):
         show_message("Saldo insuficiente para jogar!", "Pressione ENTER para voltar ao MENU")
         return None
 
-    # Deduz custo
+    # Deduz custo (já vai para o BD, pela fila)
     user_data["balance"] -= PLAY_COST
-    # ATENÇÃO: não salvamos no BD ainda, só no final do jogo (opcional)
-    # Mas se quiser garantir, salve agora:
-    db_update_user(user_data)
+    db_update_user_async(username, balance=-PLAY_COST)
 
-    daily_pot += PLAY_COST
+    add_to_daily_pot(PLAY_COST)
 
     session_start = pygame.time.get_ticks()
     base_speed = BASE_OBSTACLE_SPEED
 
+    # Dependem só do score: recalculados quando ele muda, não a cada frame
+    current_speed  = base_speed
+    spawn_interval = 90
+
+    # Escudos gastos na partida: só vão ao BD (como delta) na saída do loop
+    shields_used = 0
+
+    # Dirty rects: fase desenhada por inteiro por último e áreas do frame anterior
+    drawn_phase = None
+    prev_dirty = []
+
+    # HUD desenhado por cima do fundo e fora de prev_dirty: só é redesenhado
+    # quando o score muda ou quando algo é desenhado/apagado sobre ele, e
+    # sempre com o fundo restaurado antes (o texto tem bordas semitransparentes
+    # que escureceriam se fossem mescladas duas vezes)
+    hud_stale = True
+    hud_rect = None
+
+    # Números do HUD: saldo e pot não mudam durante a partida e o score só é
+    # re-renderizado quando aumenta (os rótulos vêm prontos de HUD_LABELS)
+    score_surf = render_int(score)
+    bal_surf   = render_int(user_data['balance'])
+    pot_surf   = render_int(daily_pot)
+
     # Tenta música de fundo
-    try:
-        mixer.music.load("assets/game_music.wav")
-        mixer.music.play(-1)
-    except:
-        pass
+    play_music(GAME_MUSIC)
 
-    while True:
-        clock.tick(FPS)
+    # Tela final já apresentada: nada mais muda até o jogador apertar uma tecla
+    game_over_shown = False
 
-        # Anti-cheat (simples)
-        elapsed_time = (pygame.time.get_ticks() - session_start) / 1000
-        if elapsed_time > 0 and score / elapsed_time > 5:
+    # Atalhos locais para o que é chamado todo frame (evita buscas globais e de atributo)
+    blit = screen.blit
+    tick = clock.tick
+    get_ticks = pygame.time.get_ticks
+    get_events = pygame.event.get
+
+    while True:
+        if game_over_shown:
+            # Dorme em event.wait() em vez de redesenhar e dar flip a 60 FPS
+            events = [pygame.event.wait()]
+            if events[0].type in EXPOSE_EVENTS:
+                pygame.display.flip()
+                continue
+        else:
+            tick(FPS)
+            events = get_events()
+        # Um único instante por frame, usado pelo anti-cheat e pela animação do fundo
+        now = get_ticks()
+
+        # Anti-cheat (simples): mais de 5 pontos por segundo. Em inteiros,
+        # score / (ms/1000) > 5  <=>  score * 200 > ms, sem divisão nem
+        # caso especial para o tempo zero.
+        if not game_over and score * 200 > now - session_start:
             cheat_detected = True
             game_over = True
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
+                if shields_used: db_update_user_async(username, shield=-shields_used)
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     if game_over:
                         # Sai do loop
+                        if shields_used: db_update_user_async(username, shield=-shields_used)
                         return score if not cheat_detected else "cheat"
                     else:
                         # Pulo
@@ -781,11 +1443,18 @@ def game_loop(username):
                         user_data["shield"] -= 1
                         player.shield_active = True
                         shield_timer = 120
-                        db_update_user(user_data)  # se quiser salvar imediatamente
+                        shields_used += 1
                         if powerup_sound: powerup_sound.play()
                 elif event.key == pygame.K_d:
-                    # Força fim do dia
+                    # Força fim do dia: o daily_score desta partida precisa
+                    # estar no BD antes da apuração do vencedor
+                    db_update_user_async(username, shield=-shields_used,
+                                         daily_score=user_data["daily_score"])
                     return "end_day"
+            elif event.type in EXPOSE_EVENTS:
+                # Janela descoberta/restaurada: as áreas fora dos dirty rects
+                # estão velhas, então este frame é redesenhado inteiro com flip()
+                drawn_phase = None
 
         if not game_over:
             player.update()
@@ -796,133 +1465,158 @@ def game_loop(username):
                 if shield_timer <= 0:
                     player.shield_active = False
 
-            # Acelera obstáculo conforme score
-            current_speed = base_speed + score*0.05
-
             # Spawna obstáculo
             spawn_timer += 1
-            if spawn_timer > max(60, 90 - score//2):
-                obstacles.append(Obstacle())
+            if spawn_timer > spawn_interval:
+                obstacles.append(spawn_obstacle())
                 spawn_timer = 0
 
-            # Atualiza e remove obstáculos fora da tela
-            for obs in obstacles[:]:
+            # Atualiza obstáculos e descarta os que saíram da tela numa só passada
+            # (sem copiar a lista nem pagar o O(n) de list.remove a cada saída);
+            # a mesma passada junta os Rects para a colisão
+            scored = 0
+            alive = []
+            rects = []
+            for obs in obstacles:
                 obs.update(current_speed)
                 if obs.x + obs.width < 0:
-                    obstacles.remove(obs)
-                    score += 1
+                    scored += 1
+                    _free_obstacles.append(obs)
                     if point_sound: point_sound.play()
-
-            # Detecção de colisão
-            # Para otimizar, poderíamos checar bounding circle ou quad-tree,
-            # mas aqui deixamos rect.colliderect() mesmo.
-            for obs in obstacles:
-                if not player.shield_active and player.rect.colliderect(obs.rect):
-                    if collision_sound: collision_sound.play()
-                    game_over = True
-
-            # Atualiza daily_score em memória (apenas local)
-            if score > user_data["daily_score"]:
-                user_data["daily_score"] = score
-                # Se for o maior do dia
-                if daily_winner is None or score > daily_winner[1]:
-                    daily_winner = (username, score)
-
-        # Render
-        draw_background(screen, score)
-        player.draw(screen)
+                else:
+                    alive.append(obs)
+                    rects.append(obs.rect)
+            obstacles = alive
+
+            if scored:
+                score += scored
+                score_surf = render_int(score)
+                hud_stale = True
+                # Acelera obstáculo e encurta o spawn conforme score
+                current_speed  = base_speed + score*0.05
+                spawn_interval = max(60, 90 - score//2)
+
+                # Atualiza daily_score em memória (apenas local)
+                if score > user_data["daily_score"]:
+                    user_data["daily_score"] = score
+
+            # Detecção de colisão: um único collidelist() varre todos os
+            # obstáculos em C (e nem é chamado com o escudo ativo).
+            if not player.shield_active and player.rect.collidelist(rects) != -1:
+                if collision_sound: collision_sound.play()
+                game_over = True
+        elif game_over_shown:
+            continue
+
+        # Render: fora uma troca de fase, só restauramos o fundo sob o que foi
+        # desenhado no frame anterior e enviamos à tela apenas essas áreas.
+        phase = get_phase(score)
+        # O HUD precisa ser refeito se mudou, se a restauração de prev_dirty
+        # o apaga ou se um sprite deste frame (player com escudo, obstáculos) cai sobre ele
+        hud_redraw = (hud_stale or phase != drawn_phase or
+                      hud_rect.collidelist(prev_dirty) != -1 or
+                      hud_rect.colliderect(player.rect.inflate(10, 10)) or
+                      hud_rect.collidelist([obs.rect for obs in obstacles]) != -1)
+        if phase != drawn_phase:
+            dirty = draw_background(screen, score, now)
+        elif hud_redraw:
+            dirty = draw_background(screen, score, now, prev_dirty + [hud_rect])
+        else:
+            # Uma decoração sobre o HUD restaura o fundo sob ele também
+            dirty = draw_background(screen, score, now, prev_dirty, hud_rect)
+            hud_redraw = hud_rect.collidelist(dirty) != -1
+        dirty.append(player.draw(screen))
         for obs in obstacles:
-            obs.draw(screen)
-
-        score_surf = FONT.render(f"Score: {score}", True, BLACK)
-        bal_surf   = FONT.render(f"Saldo: {user_data['balance']}", True, BLACK)
-        pot_surf   = FONT.render(f"Pot: {daily_pot}", True, BLACK)
-        screen.blit(score_surf, (10, 10))
-        screen.blit(bal_surf,   (10, 40))
-        screen.blit(pot_surf,   (10, 70))
+            dirty.append(obs.draw(screen))
+
+        hud_update = []
+        if hud_redraw:
+            hud_rects = [blit(label, pos) for label, pos in zip(HUD_LABELS, HUD_LABEL_POS)]
+            hud_rects.append(blit(score_surf, HUD_VALUE_POS[0]))
+            hud_rects.append(blit(bal_surf,   HUD_VALUE_POS[1]))
+            hud_rects.append(blit(pot_surf,   HUD_VALUE_POS[2]))
+            new_hud_rect = hud_rects[0].unionall(hud_rects[1:])
+            hud_update = [new_hud_rect.union(hud_rect) if hud_rect else new_hud_rect]
+            hud_rect = new_hud_rect
+            hud_stale = False
 
         if game_over:
-            msg = "Cheating detected!" if cheat_detected else "Game Over!"
-            over_surf = FONT.render(f"{msg} Press SPACE to finish.", True, RED if cheat_detected else BLACK)
-            screen.blit(over_surf, (20, HEIGHT//2 - 20))
-
-        pygame.display.flip()
+            dirty.append(blit(CHEAT_BANNER if cheat_detected else GAME_OVER_BANNER, (20, HEIGHT//2 - 20)))
+            game_over_shown = True
+
+        update_rects = prev_dirty + dirty + hud_update
+        if phase != drawn_phase:
+            pygame.display.flip()
+            drawn_phase = phase
+        elif (len(update_rects) > DIRTY_RECT_LIMIT or
+              sum(r.w * r.h for r in update_rects) > DIRTY_AREA_LIMIT):
+            pygame.display.flip()
+        else:
+            pygame.display.update(update_rects)
+        prev_dirty = dirty
 
     # (Não deve chegar aqui, pois retornamos dentro do loop)
     mixer.music.stop()
 
 def end_of_day():
-    global daily_pot, daily_winner, owner_balance
-    if daily_winner:
-        winner_name, winner_score = daily_winner
-        user_data = db_get_user(winner_name)
-        if user_data:
-            reward = daily_pot // 2
-            user_data["balance"] += reward
-            db_update_user(user_data)
-
-            owner_balance += daily_pot - reward
-
-            msg = (
-                f"Fim do dia!\n"
-                f"Vencedor: {winner_name} ({winner_score})\n"
-                f"Recebeu: {reward} créditos\n"
-                f"Dono: {daily_pot - reward} créditos"
-            )
-            show_message(msg, "Pressione ENTER para voltar ao MENU")
-        else:
-            show_message("Vencedor não encontrado no BD.", "Pressione ENTER para voltar ao MENU")
+    global owner_balance
+
+    # Passa pela fila de escrita (e espera): assim roda depois das gravações
+    # ainda pendentes, inclusive os scores e o pot da última partida
+    settled = db_write_async(db_settle_day).result()
+    # Saldos e daily_score mudaram no BD: as linhas em cache ficaram velhas
+    _USER_CACHE.clear()
+
+    if settled:
+        winner_name, winner_score, reward, owner_cut, owner_balance = settled
+
+        msg = (
+            f"Fim do dia!\n"
+            f"Vencedor: {winner_name} ({winner_score})\n"
+            f"Recebeu: {reward} créditos\n"
+            f"Dono: {owner_cut} créditos"
+        )
+        show_message(msg, "Pressione ENTER para voltar ao MENU")
     else:
         show_message("Fim do dia! Nenhum score registrado.", "Pressione ENTER para voltar ao MENU")
 
-    daily_pot = 0
-    daily_winner = None
-
-    # Zera daily_score de todo mundo
-    with db_connect() as conn:
-        with conn.cursor() as cur:
-            cur.execute("UPDATE users SET daily_score = 0;")
-            conn.commit()
+    reset_daily_pot()
 
 # ----------------------------------------------
 # MAIN
 # ----------------------------------------------
+def play_session(username):
+    """Roda uma partida e trata o resultado."""
+    result = game_loop(username)
+    if result is None:
+        # Saldo insuficiente
+        show_message("Saldo insuficiente!", "Pressione ENTER para voltar ao MENU")
+    elif result == "end_day":
+        end_of_day()
+    elif result == "cheat":
+        show_message("Cheating detected! Session terminated.", "Pressione ENTER para voltar ao MENU")
+    else:
+        # Salva o score e atualiza daily_score/high_score numa única ida
+        # ao BD (durante a partida eles só mudam em memória)
+        db_finalize_session_async(username, result)
+
+        show_message(f"Fim da sessão.\nSeu Score: {result}", "Pressione ENTER para voltar ao MENU")
+
+# Ação de cada botão do menu (pelo texto do botão em minúsculas); todas
+# recebem o username
+MENU_ACTIONS = {
+    "jogar":      play_session,
+    "loja":       shop_screen,
+    "ranking":    lambda username: ranking_screen(),
+    "como jogar": lambda username: tutorial_screen(),
+    "sair":       lambda username: sys.exit(),
+}
+
 def main():
     db_init()
     username = login_screen()
     while True:
-        selection = main_menu(username)
-        if selection == "jogar":
-            result = game_loop(username)
-            if result is None:
-                # Saldo insuficiente
-                show_message("Saldo insuficiente!", "Pressione ENTER para voltar ao MENU")
-                continue
-            if result == "end_day":
-                end_of_day()
-            elif result == "cheat":
-                show_message("Cheating detected! Session terminated.", "Pressione ENTER para voltar ao MENU")
-            else:
-                # Salvamos score no BD (apenas no final)
-                db_save_score(username, result)
-
-                # Atualiza high_score se for maior
-                user_data = db_get_user(username)
-                if user_data and result > user_data["high_score"]:
-                    user_data["high_score"] = result
-                    db_update_user(user_data)
-
-                show_message(f"Fim da sessão.\nSeu Score: {result}", "Pressione ENTER para voltar ao MENU")
-
-        elif selection == "loja":
-            shop_screen(username)
-        elif selection == "ranking":
-            ranking_screen()
-        elif selection == "como jogar":
-            tutorial_screen()
-        elif selection == "sair":
-            pygame.quit()
-            sys.exit()
+        MENU_ACTIONS[main_menu(username)](username)
 
 if __name__ == "__main__":
     main()